@@ -15,6 +15,9 @@ import re
 import argparse
 
 
+_SPLIT_NAME_RE = re.compile(r'^(.*?)(\d+)$')
+
+
 def parse_args():
     parser = argparse.ArgumentParser(description="Generate synthetic CSV with N jobs.")
     parser.add_argument('-i', '--input', required=True, help="Path to base CSV file")
@@ -24,7 +27,7 @@ def parse_args():
 
 
 def split_name(name):
-    m = re.match(r'^(.*?)(\d+)$', name)
+    m = _SPLIT_NAME_RE.match(name)
     if m:
         prefix, num_str = m.groups()
         width = len(num_str)
@@ -37,31 +40,32 @@ def split_name(name):
 
 def main():
     args = parse_args()
-    # Read base CSV
+    # Read base CSV: header plus the first non-blank data row
     with open(args.input, newline='') as f:
-        reader = csv.DictReader(f)
-        header = reader.fieldnames
-        rows = list(reader)
-        if not rows:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        base_row = next((r for r in reader if r), None)
+        if base_row is None:
             raise ValueError("Input CSV must have at least one data row.")
-        base_row = rows[0]
+    if 'job_name' not in header:
+        raise ValueError("Input CSV must have a job_name column.")
+    # Pad short rows like DictReader did; the template is positional
+    template = (base_row + [''] * len(header))[:len(header)]
+    name_idx = header.index('job_name')
 
     # Parse job_name into prefix and starting index
-    prefix, start, width = split_name(base_row['job_name'])
+    prefix, start, width = split_name(template[name_idx])
+    # Pre-built format string; braces in the prefix are escaped for str.format
+    safe_prefix = prefix.replace('{', '{{').replace('}', '}}')
+    fmt = f"{safe_prefix}{{:0{width}d}}" if width else safe_prefix + "{}"
 
-    # Write synthetic CSV
-    with open(args.output, 'w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=header)
-        writer.writeheader()
+    # Write synthetic CSV: reuse one positional row and only swap job_name
+    with open(args.output, 'w', newline='', buffering=1 << 20) as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
         for i in range(args.num):
-            idx = start + i
-            if width:
-                job_name = f"{prefix}{str(idx).zfill(width)}"
-            else:
-                job_name = f"{prefix}{idx}"
-            new_row = base_row.copy()
-            new_row['job_name'] = job_name
-            writer.writerow(new_row)
+            template[name_idx] = fmt.format(start + i)
+            writer.writerow(template)
 
 
 if __name__ == '__main__':
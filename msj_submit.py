@@ -9,36 +9,59 @@ Features:
     • Reads msj_config.csv & job_inputs_matrix.csv in cwd
     • Uploads input files via rescale-cli
     • Builds job JSON on‑the‑fly (supports multi‑analysis)
-    • Burst/throttle logic with short & long gaps
-    • Parallel uploads / submits (thread pool)
+    • Token-bucket burst throttle (x jobs per long gap, short gap between)
+    • Parallel uploads / submits (thread pool, AIMD-adaptive concurrency)
+    • Concurrent file uploads (at most max_concurrent_uploads at a time)
+    • Each distinct input file is uploaded once and reused across jobs
     • Retries & ledger logging
 """
 
+from __future__ import annotations
+
 import argparse
 import csv
 import datetime as dt
+import functools
+import itertools
 import json
 import logging
 import os
 import queue
+import random
 import re
 import subprocess
 import sys
 import threading
 import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator, NamedTuple
 
-import requests
+if TYPE_CHECKING:
+    import requests
 
 
 # -----------------------------------------------------------
 # Config & constants
 # -----------------------------------------------------------
 PLATFORM_URL = "https://platform.rescale.com/api/v2/jobs/"
-UPLOAD_ID_REGEX = re.compile(r"File ID (\w+)")
+UPLOAD_ID_REGEX = re.compile(rb"File ID (\w+)")
 LEDGER_FILE = "msj_ledger.csv"
 LOG_FILE = "msj.log"
 SUBMIT_URL_TMPL = "https://platform.rescale.com/api/v2/jobs/{}/submit/"
+HTTP_TIMEOUT = (5, 30)  # (connect, read) seconds
+RETRY_BACKOFF_SECONDS = (5, 10, 20, 40, 80, 160)  # capped at the last entry
+
+# Cheap unique ids for dry-run uploads/jobs (next() on count is atomic)
+_DRY_COUNTER = itertools.count()
+
+# Dry runs stamp every job with the run's start time (set in main)
+_DRY_NOW: str | None = None
+
+# Shared keep-alive session (thread-safe); created by init_session() so that
+# requests/urllib3 are only imported for real (non dry-run) submissions
+_SESSION: requests.Session | None = None
 
 
 # -----------------------------------------------------------
@@ -75,6 +98,7 @@ def load_config(path: Path) -> dict:
         "short_gap_seconds": "2",
         "long_gap_minutes": "10",
         "max_concurrent_submissions": "10",
+        "max_concurrent_uploads": "8",
         "max_retries": "3",
         "default_command_secondary": "#none",
         "log_level": "INFO",
@@ -85,40 +109,113 @@ def load_config(path: Path) -> dict:
     return cfg
 
 
-def parse_matrix(path: Path) -> list[dict]:
-    required = [
-        "job_name",
-        "input_files",
-        "num_cores",
-        "walltime",
-        "analysis_codes",
-        "analysis_versions",
-        "hardware_type",
-        "command",
-    ]
+class Job(NamedTuple):
+    """One validated matrix row, with analyses and hardware pre-parsed."""
+
+    job_name: str
+    input_files: str
+    command: str
+    hardware_type: str
+    codes: tuple[str, ...]
+    vers: tuple[str, ...]
+    hw_key: tuple[int, str, int]  # (num_cores, hardware_type, walltime)
+
+
+MATRIX_COLUMNS = [
+    "job_name",
+    "input_files",
+    "num_cores",
+    "walltime",
+    "analysis_codes",
+    "analysis_versions",
+    "hardware_type",
+    "command",
+]
+
+
+def check_matrix(path: Path) -> dict[str, int]:
+    """
+    Check the matrix exists and has every required column, before any job
+    work starts. Returns the header's column → index map.
+    """
     if not path.exists():
         logging.error("Job matrix %s not found.", path)
         sys.exit(1)
 
-    jobs = []
-    with path.open() as f:
-        reader = csv.DictReader(f)
-        missing = [c for c in required if c not in reader.fieldnames]
-        if missing:
-            logging.error("CSV missing required columns: %s", missing)
-            sys.exit(1)
+    with path.open(newline="") as f:
+        header = next(csv.reader(f), [])
+    col_idx = {name: i for i, name in enumerate(header)}
+    missing = [c for c in MATRIX_COLUMNS if c not in col_idx]
+    if missing:
+        logging.error("CSV missing required columns: %s", missing)
+        sys.exit(1)
+    return col_idx
+
+
+def parse_job_row(row: list[str], col_idx: dict[str, int]) -> Job:
+    """
+    Build a Job from one raw CSV row; raises ValueError describing the problem.
+    """
+    if len(row) <= max(col_idx[c] for c in MATRIX_COLUMNS):
+        raise ValueError("too few columns")
+    codes, vers = parse_analyses(
+        row[col_idx["analysis_codes"]], row[col_idx["analysis_versions"]]
+    )
+    if len(codes) != len(vers):
+        raise ValueError("analysis_codes count != analysis_versions count")
+    hw = row[col_idx["hardware_type"]]
+    try:
+        hw_key = (int(row[col_idx["num_cores"]]), hw, int(row[col_idx["walltime"]]))
+    except ValueError:
+        raise ValueError("num_cores and walltime must be integers") from None
+
+    return Job(
+        row[col_idx["job_name"]],
+        row[col_idx["input_files"]],
+        row[col_idx["command"]],
+        hw,
+        codes,
+        vers,
+        hw_key,
+    )
+
 
+def validate_matrix(path: Path, col_idx: dict[str, int]) -> set[str]:
+    """
+    Check every row up front so a bad matrix aborts before anything is
+    submitted. Returns the distinct paths named in the input_files column.
+    """
+    input_files: set[str] = set()
+    bad_rows = 0
+    with path.open(newline="") as f:
+        reader = csv.reader(f)
+        next(reader, None)  # header
         for i, row in enumerate(reader, start=2):
-            codes = row["analysis_codes"].split(";")
-            vers = row["analysis_versions"].split(";")
-            if len(codes) != len(vers):
-                logging.error(
-                    "Row %d: analysis_codes count != analysis_versions count", i
-                )
-                sys.exit(1)
+            if not row:
+                continue  # blank line
+            try:
+                job = parse_job_row(row, col_idx)
+            except ValueError as e:
+                logging.error("Row %d: %s", i, e)
+                bad_rows += 1
+                continue
+            input_files.update(p.strip() for p in job.input_files.split(";"))
+    if bad_rows:
+        logging.error("%d invalid row(s) in %s. Aborting.", bad_rows, path)
+        sys.exit(1)
+    return input_files
 
-            jobs.append(row)
-    return jobs
+
+def iter_matrix(path: Path, col_idx: dict[str, int]) -> Iterator[Job]:
+    """
+    Stream jobs from a matrix already checked by validate_matrix.
+    """
+    with path.open(newline="") as f:
+        reader = csv.reader(f)
+        next(reader, None)  # header
+        for row in reader:
+            if row:
+                yield parse_job_row(row, col_idx)
 
 
 def ensure_env_token() -> str:
@@ -129,6 +226,49 @@ def ensure_env_token() -> str:
     return token
 
 
+def init_session(token: str, pool_size: int):
+    """
+    Create the shared session, size its connection pool for the worker count
+    and set the auth header once. Retries are handled by process_job, not
+    urllib3.
+    """
+    global _SESSION
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=Retry(total=0),
+    )
+    session.mount("https://", adapter)
+    session.headers["Authorization"] = f"Token {token}"
+    _SESSION = session
+
+
+def drain_batch(q: queue.Queue, max_items: int, window: float) -> tuple[list, bool]:
+    """
+    Block for one item, then keep collecting until `max_items` or `window`
+    seconds pass. Returns (batch, stop); a None sentinel sets stop.
+    """
+    batch = [q.get()]
+    deadline = time.monotonic() + window
+    while len(batch) < max_items and batch[-1] is not None:
+        timeout = deadline - time.monotonic()
+        if timeout <= 0:
+            break
+        try:
+            batch.append(q.get(timeout=timeout))
+        except queue.Empty:
+            break
+    stop = batch[-1] is None
+    if stop:
+        batch.pop()
+    return batch, stop
+
+
 # -----------------------------------------------------------
 # File upload
 # -----------------------------------------------------------
@@ -137,81 +277,183 @@ def upload_file(local_path: str, token: str, dry_run: bool = False) -> str:
     Returns Rescale fileId for uploaded file.
     """
     if dry_run:
-        fake_id = f"DRY{hash(local_path) & 0xFFFFF:X}"
+        fake_id = f"DRY{next(_DRY_COUNTER):X}"
         logging.info("[dry‑run] Would upload %s → id %s", local_path, fake_id)
         return fake_id
 
     cmd = ["rescale-cli", "upload", "-p", token, "-f", local_path]
-    proc = subprocess.run(cmd, capture_output=True, text=True)
+    # Stream merged stdout/stderr as raw bytes, keeping only the last few
+    # lines for error reporting; drain to EOF so the CLI never gets SIGPIPE.
+    file_id = None
+    tail: deque[bytes] = deque(maxlen=20)
+    with subprocess.Popen(
+        cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT
+    ) as proc:
+        for line in proc.stdout:
+            tail.append(line)
+            if file_id is None:
+                m = UPLOAD_ID_REGEX.search(line)
+                if m:
+                    file_id = m.group(1).decode()
     if proc.returncode != 0:
-        raise RuntimeError(f"Upload failed: {proc.stderr or proc.stdout}")
-
-    m = UPLOAD_ID_REGEX.search(proc.stdout + proc.stderr)
-    if not m:
+        err = b"".join(tail).decode(errors="replace")
+        raise RuntimeError(f"Upload failed: {err}")
+    if file_id is None:
         raise RuntimeError("Could not parse fileId from upload output")
-    file_id = m.group(1)
     logging.info("Uploaded %s → %s", local_path, file_id)
     return file_id
 
 
+# Single-flight upload cache: (abs path, mtime_ns, size) → Future[fileId]
+_UPLOAD_CACHE: dict[tuple, Future] = {}
+_UPLOAD_CACHE_LOCK = threading.Lock()
+
+
+def validate_input_files(paths: Iterable[str]) -> list[str]:
+    """
+    os.stat every distinct input path once, so a run fails up front with the
+    full list of missing files. Returns the missing paths, sorted.
+    """
+    missing = []
+    for p in set(paths):
+        try:
+            os.stat(p)
+        except OSError:
+            missing.append(p)
+    return sorted(missing)
+
+
+def upload_file_once(local_path: str, token: str, dry_run: bool = False) -> str:
+    """
+    Upload each distinct local file only once per run. Concurrent callers for
+    the same file wait on the in-flight upload; failures are not cached.
+    The key includes mtime and size, so a file edited mid-run is re-uploaded.
+    """
+    abs_path = os.path.abspath(local_path)
+    try:
+        st = os.stat(abs_path)
+        key = (abs_path, st.st_mtime_ns, st.st_size)
+    except OSError:
+        if not dry_run:
+            raise FileNotFoundError(f"Input file not found: {local_path}")
+        key = (abs_path, None, None)
+
+    with _UPLOAD_CACHE_LOCK:
+        fut = _UPLOAD_CACHE.get(key)
+        owner = fut is None
+        if owner:
+            fut = _UPLOAD_CACHE[key] = Future()
+
+    if owner:
+        try:
+            fut.set_result(upload_file(local_path, token, dry_run))
+        except Exception as e:
+            with _UPLOAD_CACHE_LOCK:
+                _UPLOAD_CACHE.pop(key, None)
+            fut.set_exception(e)
+    return fut.result()
+
+
+# Run-wide upload pool so at most max_concurrent_uploads CLI processes run
+# at once across all jobs; created by init_upload_pool()
+_UPLOAD_POOL: ThreadPoolExecutor | None = None
+_UPLOAD_POOL_LOCK = threading.Lock()
+
+
+def init_upload_pool(max_workers: int) -> ThreadPoolExecutor:
+    global _UPLOAD_POOL
+    with _UPLOAD_POOL_LOCK:
+        if _UPLOAD_POOL is None:
+            _UPLOAD_POOL = ThreadPoolExecutor(max_workers=max(1, max_workers))
+        return _UPLOAD_POOL
+
+
+def shutdown_upload_pool():
+    global _UPLOAD_POOL
+    with _UPLOAD_POOL_LOCK:
+        if _UPLOAD_POOL is not None:
+            _UPLOAD_POOL.shutdown(wait=True)
+            _UPLOAD_POOL = None
+
+
 def upload_files(paths: list[str], token: str, dry_run: bool = False) -> list[str]:
-    ids = []
-    for p in paths:
-        p = p.strip()
-        if not Path(p).exists() and not dry_run:
-            raise FileNotFoundError(f"Input file not found: {p}")
-        ids.append(upload_file(p, token, dry_run))
+    """
+    Upload all paths on the shared upload pool and return their fileIds in
+    input order.
+    """
+    pool = _UPLOAD_POOL or init_upload_pool(8)
+    paths = [p.strip() for p in paths]
+    ids: list[str] = [""] * len(paths)
+    futures = {
+        pool.submit(upload_file_once, p, token, dry_run): i for i, p in enumerate(paths)
+    }
+    for fut in as_completed(futures):
+        ids[futures[fut]] = fut.result()
     return ids
 
 
 # -----------------------------------------------------------
 # Job JSON builder
 # -----------------------------------------------------------
-def build_job_json(row: dict, file_ids: list[str], cfg: dict) -> dict:
-    codes = [c.strip() for c in row["analysis_codes"].split(";")]
-    vers = [v.strip() for v in row["analysis_versions"].split(";")]
-    hardware_block = {
-        "coresPerSlot": int(row["num_cores"]),
-        "coreType": row["hardware_type"],
-        "walltime": int(row["walltime"]),
-    }
+@functools.lru_cache(maxsize=128)
+def parse_analyses(codes: str, versions: str) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """
+    Split the ';'-separated analysis_codes / analysis_versions cells.
+    """
+    return (
+        tuple(c.strip() for c in codes.split(";")),
+        tuple(v.strip() for v in versions.split(";")),
+    )
+
+
+@functools.lru_cache(maxsize=128)
+def hardware_block(cores: int, core_type: str, walltime: int) -> dict:
+    """
+    Shared hardware dict per (cores, type, walltime); treat as read-only.
+    """
+    return {"coresPerSlot": cores, "coreType": core_type, "walltime": walltime}
+
+
+def build_job_json(job: Job, file_ids: list[str], cfg: dict) -> dict:
+    hw_block = hardware_block(*job.hw_key)
     input_files_json = [{"id": fid} for fid in file_ids]
 
     jobanalyses = []
-    for idx, (code, ver) in enumerate(zip(codes, vers)):
+    for idx, (code, ver) in enumerate(zip(job.codes, job.vers)):
         jobanalyses.append(
             {
                 "analysis": {"code": code, "version": ver},
-                "command": row["command"] if idx == 0 else cfg["default_command_secondary"],
-                "hardware": hardware_block,
+                "command": job.command if idx == 0 else cfg["default_command_secondary"],
+                "hardware": hw_block,
                 "inputFiles": input_files_json,
             }
         )
 
-    return {"name": row["job_name"], "jobanalyses": jobanalyses}
+    return {"name": job.job_name, "jobanalyses": jobanalyses}
 
 
 # -----------------------------------------------------------
 # Job submitter
 # -----------------------------------------------------------
-def post_job(payload: dict, token: str, dry_run: bool = False) -> tuple[str, str]:
+def post_job(
+    payload: dict,
+    token: str,
+    dry_run: bool = False,
+    limiter: AdaptiveLimiter | None = None,
+) -> tuple[str, str]:
     """
     Create the job then immediately submit/launch it.
-    Returns (job_id, submit_time).
+    Returns (job_id, submit_time). Response codes are fed to `limiter`.
     """
     if dry_run:
-        fake_id = f"JOB{hash(json.dumps(payload)) & 0xFFFFFF:X}"
-        now = dt.datetime.utcnow().isoformat()
+        fake_id = f"JOB{next(_DRY_COUNTER):X}"
         logging.info("[dry‑run] Would POST job %s", payload["name"])
-        return fake_id, now
-
-    headers = {
-        "Authorization": f"Token {token}",
-        "Content-Type": "application/json",
-    }
+        return fake_id, _DRY_NOW or dt.datetime.utcnow().isoformat()
 
     # ----- 1. CREATE (draft) -----
-    resp = requests.post(PLATFORM_URL, headers=headers, json=payload)
+    resp = _SESSION.post(PLATFORM_URL, json=payload, timeout=HTTP_TIMEOUT)
+    if limiter is not None:
+        limiter.observe(resp.status_code)
     if resp.status_code != 201:
         raise RuntimeError(f"Job CREATE failed: {resp.status_code} {resp.text}")
 
@@ -225,12 +467,14 @@ def post_job(payload: dict, token: str, dry_run: bool = False) -> tuple[str, str
         logging.debug("Create response %s: %s", resp.status_code, resp.text)
 
     # ----- 2. SUBMIT (launch) -----
-    submit_resp = requests.post(
+    submit_resp = _SESSION.post(
         SUBMIT_URL_TMPL.format(job_id),
-        headers={"Authorization": f"Token {token}"},
         json={},  # body empty is fine
+        timeout=HTTP_TIMEOUT,
     )
     logging.debug("Submit response %s: %s", submit_resp.status_code, submit_resp.text)
+    if limiter is not None:
+        limiter.observe(submit_resp.status_code)
 
     if submit_resp.status_code not in (200, 201, 202):
         raise RuntimeError(
@@ -241,11 +485,13 @@ def post_job(payload: dict, token: str, dry_run: bool = False) -> tuple[str, str
     return job_id, submit_time
 
 
-
 # -----------------------------------------------------------
 # Ledger
 # -----------------------------------------------------------
-_LEDGER_LOCK = threading.Lock()
+_LEDGER_Q: queue.Queue = queue.Queue()
+_LEDGER_BATCH = 256
+_LEDGER_FLUSH_SECONDS = 0.5
+_LEDGER_THREAD: threading.Thread | None = None
 
 
 def init_ledger():
@@ -264,65 +510,189 @@ def init_ledger():
             )
 
 
-def write_ledger(job_id: str, row: dict, submit_time: str, retries: int):
-    with _LEDGER_LOCK, open(LEDGER_FILE, "a", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(
-            [
-                job_id,
-                row["job_name"],
-                submit_time,
-                row["input_files"],
-                row["hardware_type"],
-                retries,
-            ]
-        )
+def write_ledger(job_id: str, job: Job, submit_time: str, retries: int):
+    _LEDGER_Q.put(
+        [
+            job_id,
+            job.job_name,
+            submit_time,
+            job.input_files,
+            job.hardware_type,
+            retries,
+        ]
+    )
+
+
+def ledger_flusher():
+    """
+    Drain queued ledger rows in batches (up to _LEDGER_BATCH rows or
+    _LEDGER_FLUSH_SECONDS) and append each batch with a single open/write.
+    A None entry stops the flusher after writing what is pending.
+    """
+    done = False
+    while not done:
+        batch, done = drain_batch(_LEDGER_Q, _LEDGER_BATCH, _LEDGER_FLUSH_SECONDS)
+        if batch:
+            with open(LEDGER_FILE, "a", newline="") as f:
+                csv.writer(f).writerows(batch)
+
+
+def start_ledger_flusher():
+    global _LEDGER_THREAD
+    _LEDGER_THREAD = threading.Thread(target=ledger_flusher, daemon=True)
+    _LEDGER_THREAD.start()
+
+
+def stop_ledger_flusher():
+    """Flush all pending ledger rows and stop the flusher thread."""
+    if _LEDGER_THREAD is not None:
+        _LEDGER_Q.put(None)
+        _LEDGER_THREAD.join()
+
+
+# -----------------------------------------------------------
+# Throttle
+# -----------------------------------------------------------
+class TokenBucket:
+    """
+    Monotonic-clock token bucket: holds up to `burst` tokens and refills at
+    `rate` tokens per second. acquire() blocks only while the bucket is empty.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.last) * self.rate)
+        self.last = now
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limit for in-flight jobs. Starts at `maximum`, halves on
+    429/5xx responses and grows by one after every `increase_every`
+    consecutive successes, never leaving [minimum, maximum]. After a decrease,
+    further failures are ignored until as many responses as were in flight
+    (or the pre-decrease limit) have come in, so one burst of throttled
+    requests only halves the limit once.
+
+    >>> limiter = AdaptiveLimiter(8)
+    >>> for _ in range(8):  # 8 concurrent requests all throttled
+    ...     limiter.observe(429)
+    >>> limiter.current
+    4
+    """
+
+    def __init__(self, maximum: int, minimum: int = 1, increase_every: int = 5):
+        self.maximum = max(1, maximum)
+        self.minimum = max(1, min(minimum, self.maximum))
+        self.increase_every = increase_every
+        self.current = self.maximum
+        self.in_flight = 0
+        self._successes = 0
+        self._observed = 0  # responses seen so far
+        self._hold_until = 0  # no decrease before this many responses
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while self.in_flight >= self.current:
+                self._cond.wait()
+            self.in_flight += 1
+
+    def release(self):
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify()
+
+    def on_success(self):
+        with self._cond:
+            self._observed += 1
+            self._successes += 1
+            if self._successes >= self.increase_every and self.current < self.maximum:
+                self._successes = 0
+                self.current += 1
+                self._cond.notify()
+
+    def on_failure(self):
+        with self._cond:
+            self._observed += 1
+            self._successes = 0
+            if self._observed < self._hold_until:
+                return  # same congestion episode as the last decrease
+            old = self.current
+            new = max(self.minimum, old // 2)
+            if new != old:
+                logging.warning("Throttled by API: concurrency %d → %d", old, new)
+                self.current = new
+            # Responses from requests already in flight belong to this episode
+            self._hold_until = self._observed + max(self.in_flight, old)
+
+    def observe(self, status_code: int):
+        if status_code == 429 or status_code >= 500:
+            self.on_failure()
+        elif 200 <= status_code < 300:
+            self.on_success()
 
 
 # -----------------------------------------------------------
 # Worker & scheduler
 # -----------------------------------------------------------
-def worker(
-    q: queue.Queue,
+def process_job(
+    job: Job,
     token: str,
     cfg: dict,
     dry_run: bool = False,
+    limiter: AdaptiveLimiter | None = None,
 ):
+    """
+    Upload, build, submit and ledger a single job, retrying on failure.
+    """
     max_retries = int(cfg["max_retries"])
+    retries = 0
     while True:
-        row = q.get()
-        if row is None:
-            q.task_done()
-            break
-        retries = 0
         try:
-            while True:
-                try:
-                    paths = row["input_files"].split(";")
-                    ids = upload_files(paths, token, dry_run)
-                    payload = build_job_json(row, ids, cfg)
-                    job_id, submit_time = post_job(payload, token, dry_run)
-                    write_ledger(job_id, row, submit_time, retries)
-                    logging.info("Submitted job %s (%s)", row["job_name"], job_id)
-                    break
-                except Exception as e:
-                    retries += 1
-                    logging.warning(
-                        "Job %s failed attempt %d/%d: %s",
-                        row["job_name"],
-                        retries,
-                        max_retries,
-                        e,
-                    )
-                    if retries >= max_retries:
-                        logging.error("Giving up on job %s", row["job_name"])
-                        break
-                    time.sleep(5 * (2 ** (retries - 1)))  # exponential back‑off
-        finally:
-            q.task_done()
+            paths = job.input_files.split(";")
+            ids = upload_files(paths, token, dry_run)
+            payload = build_job_json(job, ids, cfg)
+            job_id, submit_time = post_job(payload, token, dry_run, limiter)
+            write_ledger(job_id, job, submit_time, retries)
+            logging.info("Submitted job %s (%s)", job.job_name, job_id)
+            return
+        except Exception as e:
+            retries += 1
+            logging.warning(
+                "Job %s failed attempt %d/%d: %s",
+                job.job_name,
+                retries,
+                max_retries,
+                e,
+            )
+            if retries >= max_retries:
+                logging.error("Giving up on job %s", job.job_name)
+                return
+            # exponential back‑off plus jitter so retrying workers spread out
+            backoff = RETRY_BACKOFF_SECONDS[min(retries, len(RETRY_BACKOFF_SECONDS)) - 1]
+            time.sleep(backoff + random.uniform(0, 1))
 
 
 def main():
+    global _DRY_NOW
     ap = argparse.ArgumentParser(description="MSJ v0.01 – Mass Job Submit")
     ap.add_argument("--dry-run", action="store_true", help="Do everything except network")
     ap.add_argument("--config", default="msj_config.csv", help="Config CSV path")
@@ -335,42 +705,51 @@ def main():
         logging.getLogger("urllib3").setLevel(logging.WARNING)
 
     token = ensure_env_token()
-    jobs = parse_matrix(Path("job_inputs_matrix.csv"))
+    if args.dry_run:
+        _DRY_NOW = dt.datetime.utcnow().isoformat()
+    else:
+        init_session(token, int(cfg["max_concurrent_submissions"]))
+    matrix = Path("job_inputs_matrix.csv")
+    col_idx = check_matrix(matrix)
+    input_files = validate_matrix(matrix, col_idx)
+    if not args.dry_run:
+        missing = validate_input_files(input_files)
+        if missing:
+            logging.error("Input files not found: %s", missing)
+            sys.exit(1)
+    jobs = iter_matrix(matrix, col_idx)
     init_ledger()
+    start_ledger_flusher()
+    init_upload_pool(int(cfg["max_concurrent_uploads"]))
 
-    # Thread pool
+    # Thread pool; the limiter bounds in-flight jobs and adapts to API pushback
     num_workers = int(cfg["max_concurrent_submissions"])
-    q: queue.Queue = queue.Queue(maxsize=num_workers * 2)
-    threads = []
-    for _ in range(num_workers):
-        t = threading.Thread(
-            target=worker, args=(q, token, cfg, args.dry_run), daemon=True
-        )
-        t.start()
-        threads.append(t)
+    limiter = AdaptiveLimiter(num_workers)
+
+    def on_done(fut: Future):
+        limiter.release()
+        if fut.exception() is not None:
+            logging.error("Worker crashed: %s", fut.exception())
 
-    # Burst scheduler
-    x_jobs = int(cfg["x_jobs_per_burst"])
+    # Burst scheduler: x_jobs per long_gap window, short_gap between submits
+    # Like the old burst counter, a value below 1 means one job per long gap
+    x_jobs = max(int(cfg["x_jobs_per_burst"]), 1)
     short_gap = float(cfg["short_gap_seconds"])
     long_gap = float(cfg["long_gap_minutes"]) * 60
-
-    counter = 0
-    for row in jobs:
-        q.put(row)
-        counter += 1
-        if counter >= x_jobs:
-            logging.info("Burst limit reached: resting %.0f s", long_gap)
-            counter = 0
-            time.sleep(long_gap)
-        else:
-            time.sleep(short_gap)
-
-    # Finish
-    q.join()
-    for _ in threads:
-        q.put(None)  # sentinel
-    for t in threads:
-        t.join()
+    bucket = TokenBucket(x_jobs / long_gap if long_gap > 0 else float("inf"), x_jobs)
+
+    try:
+        with ThreadPoolExecutor(max_workers=num_workers) as ex:
+            for job in jobs:
+                bucket.acquire()
+                limiter.acquire()
+                fut = ex.submit(process_job, job, token, cfg, args.dry_run, limiter)
+                fut.add_done_callback(on_done)
+                time.sleep(short_gap)
+            # Leaving the with-block waits for all in-flight jobs
+    finally:
+        shutdown_upload_pool()
+        stop_ledger_flusher()
 
     logging.info("All done! Ledger written to %s", LEDGER_FILE)
 